@@ -1,23 +1,61 @@
 # backend/app/main.py
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, ValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import List
 from dotenv import load_dotenv
-import json
-import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import logging
 import os
-import requests
-from groq import Groq
+import posixpath
+import tempfile
+import time
+import uuid
+import zipfile
+import httpx
+import orjson
+from groq import AsyncGroq
+from tokenizers import Tokenizer
+
+import numpy as np
+import xxhash
 
 # PDF & DOCX libs
 import fitz  # PyMuPDF
-from docx import Document
+from lxml import etree
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
-# App & CORS
+# App, CORS & compression
 # -----------------------------------------------------------------------------
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # fetched in the background; chunking uses the char heuristic until it's ready
+    _schedule_tokenizer_load()
+    # Start the parse workers (and their MuPDF warm-up) now rather than on the first upload.
+    # With fork, the first submit starts all max_workers; with spawn/forkserver, workers
+    # start on demand, so submit one no-op per worker.
+    pool = _get_parse_pool()
+    for _ in range(PDF_MAX_WORKERS):
+        pool.submit(int)
+    yield
+    global hf_client
+    if hf_client is not None:
+        await hf_client.aclose()
+        hf_client = None
+    if _parse_pool is not None:
+        # also clears the global, so a later startup builds a fresh pool
+        _reset_parse_pool(_parse_pool)
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:5173",
@@ -32,6 +70,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# extracted text responses can be MBs of (very compressible) legal prose
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # -----------------------------------------------------------------------------
 # Config
 # -----------------------------------------------------------------------------
@@ -44,16 +85,57 @@ def _clean(s: str | None) -> str | None:
     return s.strip().strip('"').strip("'")
 
 MAX_UPLOAD_MB = 20
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Extracted text is served from GET /api/upload/{id}/text; the client fetches it once,
+# right after upload, so only keep it briefly and cap the total held in memory
+EXTRACTED_TEXT_TTL_S = 5 * 60
+EXTRACTED_TEXT_MAX_DOCS = 64
+EXTRACTED_TEXT_MAX_CHARS = 64 * 1024 * 1024
+TEXT_STREAM_CHUNK_CHARS = 64 * 1024
 ALLOWED_EXTS = {".pdf", ".docx"}
 
+# PDF extraction fans page ranges out to worker processes.
+# PyMuPDF is not thread-safe and holds the GIL, so threads would not help here.
+PDF_MAX_WORKERS = min(8, os.cpu_count() or 1)  # capped to limit MuPDF memory per worker
+PDF_MIN_PAGES_PER_WORKER = 16                  # smaller docs are handled by one worker
+# PyMuPDF's text default (TEXTFLAGS_TEXT) minus TEXT_PRESERVE_LIGATURES and
+# TEXT_PRESERVE_WHITESPACE; keeps TEXT_MEDIABOX_CLIP and TEXT_CID_FOR_UNKNOWN_UNICODE
+# (without it, glyphs lacking a ToUnicode mapping come out as U+FFFD).
+# TEXT_DEHYPHENATE was measured ~25% slower per page, so it is left off.
+PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~(fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE)
+# Workers are long-lived; empty MuPDF's resource store after docs larger than this
+PDF_STORE_SHRINK_BYTES = 5 * 1024 * 1024
+
 HF_TOKEN = _clean(os.getenv("HUGGINGFACE_API_TOKEN"))
 HF_MODEL = _clean(os.getenv("HF_MODEL")) or "HuggingFaceH4/zephyr-7b-beta"
 HF_URL = f"https://api-inference.huggingface.co/models/{HF_MODEL}"
 HF_HEADERS = {"Authorization": f"Bearer {HF_TOKEN}"} if HF_TOKEN else {}
+# shared client so status polling reuses pooled connections (no TLS handshake per call)
+# (follow_redirects matches the old requests.get behaviour: report the final status)
+# Built lazily and dropped at shutdown, so a restarted lifespan gets a fresh client
+hf_client: httpx.AsyncClient | None = None
+
+def _get_hf_client() -> httpx.AsyncClient:
+    global hf_client
+    if hf_client is None:
+        hf_client = httpx.AsyncClient(headers=HF_HEADERS, timeout=15, follow_redirects=True)
+    return hf_client
 
 # Groq config
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-groq_client = Groq(api_key=GROQ_API_KEY)
+groq_client = AsyncGroq(api_key=GROQ_API_KEY)
+GROQ_MAX_CONCURRENCY = 6  # in-flight Groq requests across all summarize calls
+_groq_semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+
+# Tokenizer used for chunk sizing; should match the Groq model's vocabulary
+# (ungated mirror of the Llama 3.1 tokenizer, so no HF token is needed)
+TOKENIZER_MODEL = _clean(os.getenv("TOKENIZER_MODEL")) or "unsloth/Meta-Llama-3.1-8B-Instruct"
+TOKENIZER_RETRY_S = 5 * 60  # wait this long before retrying a failed tokenizer fetch
+
+# Summary cache (in-process; re-uploaded drafts/templates skip Groq entirely)
+SUMMARY_CACHE_TTL_S = 24 * 60 * 60
+SUMMARY_CACHE_MAX_DOCS = 256
+SUMMARY_CACHE_MAX_CHUNKS = 4096
 
 # -----------------------------------------------------------------------------
 # Routes: health/root
@@ -63,9 +145,9 @@ def read_root():
     return {"message": "Welcome to Veris – Your AI Legal Assistant"}
 
 @app.get("/api/hf_status")
-def hf_status():
+async def hf_status():
     try:
-        r = requests.get(f"https://api-inference.huggingface.co/status/{HF_MODEL}", headers=HF_HEADERS, timeout=15)
+        r = await _get_hf_client().get(f"https://api-inference.huggingface.co/status/{HF_MODEL}")
         return {
             "model": HF_MODEL,
             "url": HF_URL,
@@ -75,30 +157,225 @@ def hf_status():
     except Exception as e:
         return {"model": HF_MODEL, "url": HF_URL, "error": str(e)}
 
+# -----------------------------------------------------------------------------
+# Helpers: in-process cache
+# -----------------------------------------------------------------------------
+class _TTLCache:
+    """Small LRU cache with per-entry expiry (not shared across workers).
+
+    With `max_size`, entries are also evicted oldest-first while the summed
+    `sizeof(value)` exceeds it (the newest entry is always kept).
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float, max_size: int | None = None, sizeof=len):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self._data: OrderedDict = OrderedDict()
+        self._size = 0
+
+    def _pop(self, key: str) -> None:
+        _, value = self._data.pop(key)
+        if self.max_size is not None:
+            self._size -= self.sizeof(value)
+
+    def get(self, key: str):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value) -> None:
+        if key in self._data:
+            self._pop(key)
+        self._data[key] = (time.monotonic() + self.ttl_s, value)
+        if self.max_size is not None:
+            self._size += self.sizeof(value)
+        # drop expired entries at the cold end so they don't count against the limits
+        now = time.monotonic()
+        while self._data:
+            oldest = next(iter(self._data))
+            if self._data[oldest][0] >= now:
+                break
+            self._pop(oldest)
+        while len(self._data) > self.max_entries or (
+            self.max_size is not None and self._size > self.max_size and len(self._data) > 1
+        ):
+            self._pop(next(iter(self._data)))
+
 # -----------------------------------------------------------------------------
 # Helpers: extraction
 # -----------------------------------------------------------------------------
-def extract_text_from_pdf(file_bytes: bytes):
-    """Return (text, pages) from a PDF."""
-    text_parts = []
-    pages = 0
-    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-        pages = len(doc)
-        for page in doc:
-            text_parts.append(page.get_text("text"))
+def _init_parse_worker():
+    """Warm up MuPDF (context, base font, text device) in a new pool worker."""
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), "Veris")
+        page.get_text("text", flags=PDF_TEXT_FLAGS)
+
+_parse_pool: ProcessPoolExecutor | None = None
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS, initializer=_init_parse_worker)
+    return _parse_pool
+
+def _reset_parse_pool(broken: ProcessPoolExecutor) -> None:
+    """Discard a pool (broken by a dead worker, or at shutdown); the next call builds a new one."""
+    global _parse_pool
+    if _parse_pool is broken:
+        _parse_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Return the text of each page in [start, stop) of a PDF (runs in a worker process)."""
+    parts = [None] * (stop - start)
+    # opened by path: MuPDF reads the file itself, no copy of the bytes in Python
+    with fitz.open(path, filetype="pdf") as doc:
+        for i in range(start, stop):
+            parts[i - start] = doc.load_page(i).get_text("text", flags=PDF_TEXT_FLAGS)
+    # cap memory growth across uploads (the store otherwise fills to MuPDF's 256 MB default)
+    if os.path.getsize(path) > PDF_STORE_SHRINK_BYTES:
+        fitz.TOOLS.store_shrink(100)
+    return parts
+
+
+def _pdf_page_count(path: str) -> int:
+    """Return the page count of a PDF (runs in a worker process)."""
+    with fitz.open(path, filetype="pdf") as doc:
+        return len(doc)
+
+
+async def extract_text_from_pdf(path: str, pool: ProcessPoolExecutor):
+    """Return (text, pages) from a PDF file.
+
+    Every MuPDF call (page count included) runs in a pool worker, never in a
+    server thread.
+    """
+    loop = asyncio.get_running_loop()
+    pages = await loop.run_in_executor(pool, _pdf_page_count, path)
+
+    # Split into contiguous page ranges (a single one for short docs);
+    # each worker opens its own copy of the doc.
+    step = max(PDF_MIN_PAGES_PER_WORKER, -(-pages // PDF_MAX_WORKERS))
+    starts = range(0, pages, step)
+    ranges = await asyncio.gather(*[
+        loop.run_in_executor(pool, _extract_pdf_pages, path, start, min(start + step, pages))
+        for start in starts
+    ])
+    # gather keeps submission order → fill the page slots by index, join once
+    text_parts = [None] * pages
+    for start, page_texts in zip(starts, ranges):
+        text_parts[start:start + len(page_texts)] = page_texts
     return "\n".join(text_parts).strip(), pages
 
 
-def extract_text_from_docx(file_bytes: bytes):
-    """Return text from a DOCX."""
-    bio = io.BytesIO(file_bytes)
-    doc = Document(bio)
-    paragraphs = [p.text for p in doc.paragraphs]
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# run content in document order, same elements python-docx's Paragraph.text reads
+_DOCX_RUN_CONTENT = etree.XPath(
+    "w:r/* | w:hyperlink/w:r/*",
+    namespaces={"w": _W[1:-1]},
+)
+_DOCX_CHARS = {f"{_W}tab": "\t", f"{_W}ptab": "\t", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+_DOCX_XML_PARSER = etree.XMLParser(resolve_entities=False)
+_PKG_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+def _docx_paragraph_text(p) -> str:
+    parts = []
+    for e in _DOCX_RUN_CONTENT(p):
+        if e.tag == f"{_W}t":
+            parts.append(e.text or "")
+        elif e.tag == f"{_W}br":
+            # page/column breaks carry no text
+            if e.get(f"{_W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_DOCX_CHARS.get(e.tag, ""))
+    return "".join(parts)
+
+def _docx_main_part(z: zipfile.ZipFile) -> str:
+    """Zip member name of the main document part, per the package relationships."""
+    try:
+        rels = etree.fromstring(z.read("_rels/.rels"), _DOCX_XML_PARSER)
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iterchildren(f"{_PKG_RELS}Relationship"):
+        if rel.get("Type", "").endswith("/officeDocument") and rel.get("Target"):
+            # targets are relative to the package root (a leading "/" is allowed)
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+def extract_text_from_docx(path: str):
+    """Return text from a DOCX file."""
+    # read the main document XML straight from the zip instead of building the python-docx object model
+    with zipfile.ZipFile(path) as z:
+        root = etree.fromstring(z.read(_docx_main_part(z)), _DOCX_XML_PARSER)
+    body = root.find(f"{_W}body")
+    if body is None:
+        return ""
+    # top-level body paragraphs only (like Document.paragraphs)
+    paragraphs = [_docx_paragraph_text(p) for p in body.iterchildren(f"{_W}p")]
     return "\n".join(paragraphs).strip()
 
+
+async def _spool_upload(file: UploadFile, suffix: str, max_bytes: int) -> str:
+    """Copy an upload into a named temp file, enforcing max_bytes; return its path.
+
+    Parse workers get the path rather than the bytes, so nothing is pickled
+    across processes. The caller deletes the file.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            total = 0
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                total += len(chunk)
+                if total > max_bytes:
+                    raise _file_too_large(file.size or total)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+async def _parse_upload(ext: str, path: str):
+    """Return (text, pages) for an uploaded file without blocking the event loop.
+
+    `pages` is None for DOCX.
+    """
+    pool = _get_parse_pool()
+    try:
+        if ext == ".pdf":
+            # dispatches the page count and page ranges to the pool itself
+            return await extract_text_from_pdf(path, pool)
+        # XML parsing holds the GIL → run it in a worker process
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(pool, extract_text_from_docx, path)
+        return text, None
+    except BrokenProcessPool:
+        # this upload fails, later ones get a fresh pool
+        _reset_parse_pool(pool)
+        raise
+
 # -----------------------------------------------------------------------------
 # Endpoint: upload
 # -----------------------------------------------------------------------------
+# Per-process store: with `uvicorn --workers N` the GET for text_url may reach another
+# worker and 404, so run a single worker (or move this to a shared store).
+_extracted_texts = _TTLCache(EXTRACTED_TEXT_MAX_DOCS, EXTRACTED_TEXT_TTL_S, max_size=EXTRACTED_TEXT_MAX_CHARS)
+
+def _file_too_large(size_bytes: int) -> HTTPException:
+    size_mb = size_bytes / (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"File too large ({size_mb:.1f} MB). Max allowed is {MAX_UPLOAD_MB} MB.")
+
 @app.post("/api/upload")
 async def upload_file(file: UploadFile = File(...)):
     # Validate extension
@@ -106,33 +383,48 @@ async def upload_file(file: UploadFile = File(...)):
     if ext not in ALLOWED_EXTS:
         raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a .pdf or .docx file.")
 
-    # Read bytes (enables size check + parsing)
-    file_bytes = await file.read()
+    # Size limit check — Starlette has already spooled the body to a temp file,
+    # so reject on its size before pulling anything into memory
+    max_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise _file_too_large(file.size)
 
-    # Size limit check
-    size_mb = len(file_bytes) / (1024 * 1024)
-    if size_mb > MAX_UPLOAD_MB:
-        raise HTTPException(status_code=413, detail=f"File too large ({size_mb:.1f} MB). Max allowed is {MAX_UPLOAD_MB} MB.")
+    # Copy to a named temp file in bounded chunks (size is re-checked as we go)
+    path = await _spool_upload(file, ext, max_bytes)
 
     # Extract text
     try:
-        if ext == ".pdf":
-            text, pages = extract_text_from_pdf(file_bytes)
-            return {
-                "filename": file.filename,
-                "filetype": "pdf",
-                "pages": pages,
-                "text": text,
-            }
-        else:  # ".docx"
-            text = extract_text_from_docx(file_bytes)
-            return {
-                "filename": file.filename,
-                "filetype": "docx",
-                "text": text,
-            }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to extract text: {str(e)}")
+        text, pages = await _parse_upload(ext, path)
+    except Exception:
+        # details (incl. the server-side temp path) go to the log, not the client
+        logger.exception("Failed to extract text from %r", file.filename)
+        raise HTTPException(status_code=500, detail=f"Failed to extract text: could not parse the {ext[1:].upper()} file.")
+    finally:
+        os.unlink(path)
+
+    # The text itself is fetched (streamed) separately, keeping this response small
+    upload_id = uuid.uuid4().hex
+    _extracted_texts.set(upload_id, text)
+    meta = {
+        "filename": file.filename,
+        "filetype": ext[1:],
+        "text_url": f"/api/upload/{upload_id}/text",
+    }
+    if ext == ".pdf":
+        meta["pages"] = pages
+    return meta
+
+@app.get("/api/upload/{upload_id}/text")
+async def upload_text(upload_id: str):
+    text = _extracted_texts.get(upload_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Extracted text not found or expired. Please upload the file again.")
+
+    async def generate():
+        for i in range(0, len(text), TEXT_STREAM_CHUNK_CHARS):
+            yield text[i:i + TEXT_STREAM_CHUNK_CHARS]
+
+    return StreamingResponse(generate(), media_type="text/plain")
 
 # -----------------------------------------------------------------------------
 # Summarizer: request/response models
@@ -149,94 +441,133 @@ class SummarizeResponse(BaseModel):
     summary: str
     clauses: List[Clause]
 
+_SUMMARIZE_RESPONSE = TypeAdapter(SummarizeResponse)
+
+def _summarize_response(summary: str, clauses: list) -> dict:
+    """Validate a summarize response and return it as plain data, safe to cache and send."""
+    validated = _SUMMARIZE_RESPONSE.validate_python({"summary": summary, "clauses": clauses})
+    return _SUMMARIZE_RESPONSE.dump_python(validated)
+
 # -----------------------------------------------------------------------------
-# Helpers: robust JSON parse from model output
+# Helpers: chunking & merging
 # -----------------------------------------------------------------------------
-def _try_parse_json(s: str):
-    s = s.strip()
-    # Strip accidental code fences
-    if s.startswith("```"):
-        s = s.strip("`")
-        if s.startswith("json"):
-            s = s[4:]
-    # Direct parse
+_tokenizer: Tokenizer | None = None
+_tokenizer_task: asyncio.Task | None = None
+_tokenizer_retry_at = 0.0
+
+async def _load_tokenizer() -> None:
+    global _tokenizer, _tokenizer_retry_at
     try:
-        return json.loads(s)
-    except json.JSONDecodeError:
-        # Fallback: find largest {...} block
-        start = s.find("{")
-        end = s.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            return json.loads(s[start:end + 1])
-        raise
+        # network fetch (with hub retries) → keep it off the event loop
+        _tokenizer = await asyncio.to_thread(Tokenizer.from_pretrained, TOKENIZER_MODEL, token=HF_TOKEN)
+    except Exception:
+        _tokenizer_retry_at = time.monotonic() + TOKENIZER_RETRY_S
+        logger.warning(
+            "Could not load tokenizer %r; using ~4 chars/token estimate, retrying in %ds",
+            TOKENIZER_MODEL, TOKENIZER_RETRY_S, exc_info=True,
+        )
+
+def _schedule_tokenizer_load() -> None:
+    """Start a background tokenizer fetch unless loaded, in flight, or backing off."""
+    global _tokenizer_task
+    if _tokenizer is not None or time.monotonic() < _tokenizer_retry_at:
+        return
+    if _tokenizer_task is not None and not _tokenizer_task.done():
+        return
+    _tokenizer_task = asyncio.create_task(_load_tokenizer())
+
+def _get_tokenizer() -> Tokenizer | None:
+    """The tokenizer if it has been loaded, else None (callers fall back to the heuristic)."""
+    return _tokenizer
 
 def _estimate_tokens(text: str) -> int:
-    # Rough heuristic: ~4 chars per token for English prose
-    # (good enough for keeping well under limits)
-    return max(1, len(text) // 4)
+    tok = _get_tokenizer()
+    if tok is None:
+        # Rough heuristic: ~4 chars per token for English prose
+        # (good enough for keeping well under limits)
+        return max(1, len(text) // 4)
+    return max(1, len(tok.encode(text, add_special_tokens=False).ids))
+
+def _token_ends(text: str, encoding=None) -> np.ndarray:
+    """Char offset at which each token of `text` ends (non-decreasing).
+
+    `encoding` is the tokenizer's encoding of `text`; without it the
+    ~4 chars/token heuristic of _estimate_tokens is used.
+    """
+    if encoding is None:
+        return np.minimum(np.arange(4, len(text) + 4, 4), len(text))
+    offsets = encoding.offsets
+    return np.fromiter((end for _, end in offsets), dtype=np.int64, count=len(offsets))
 
 def _split_into_chunks(text: str, max_tokens: int = 1800):
     """
-    Split text into chunks under ~max_tokens using paragraphs, then words.
+    Split text into chunks of at most max_tokens. The text is tokenized once;
+    each chunk is cut at the last newline (else space) before its token limit.
     Returns a list of strings.
     """
+    tok = _get_tokenizer()
+    encoding = tok.encode(text, add_special_tokens=False) if tok is not None else None
+    n_tokens = len(encoding) if encoding is not None else _estimate_tokens(text)
+    # Most uploads fit in one chunk → skip the offset bookkeeping entirely
+    if n_tokens <= max_tokens:
+        return [text.strip()] if text.strip() else []
+
+    ends = _token_ends(text, encoding)
     chunks = []
-    current = []
-    current_tokens = 0
-
-    paragraphs = [p.strip() for p in text.split("\n")]
-
-    for p in paragraphs:
-        if not p:
-            # preserve paragraph breaks a bit without adding tokens
-            if current and current[-1] != "":
-                current.append("")
-            continue
-
-        p_tokens = _estimate_tokens(p)
-        if p_tokens > max_tokens:
-            # paragraph itself too big → fall back to word splitting
-            words = p.split()
-            buf = []
-            buf_tokens = 0
-            for w in words:
-                t = _estimate_tokens(w) + 1  # +1 for space
-                if buf_tokens + t > max_tokens:
-                    chunks.append(" ".join(buf).strip())
-                    buf = [w]
-                    buf_tokens = _estimate_tokens(w)
-                else:
-                    buf.append(w)
-                    buf_tokens += t
-            if buf:
-                chunks.append(" ".join(buf).strip())
-            continue
-
-        # normal paragraph packing
-        if current_tokens + p_tokens > max_tokens:
-            chunks.append("\n".join(current).strip())
-            current = [p]
-            current_tokens = p_tokens
-        else:
-            current.append(p)
-            current_tokens += p_tokens
-
-    if current:
-        chunks.append("\n".join(current).strip())
+    start_char = 0
+    first_token = 0
+
+    while len(ends) - first_token > max_tokens:
+        limit = int(ends[first_token + max_tokens - 1])
+        cut = text.rfind("\n", start_char, limit)
+        if cut <= start_char:
+            cut = text.rfind(" ", start_char, limit)
+        if cut <= start_char:
+            # no break point at all → hard cut on the token boundary
+            cut = limit
+        chunks.append(text[start_char:cut].strip())
+        start_char = cut
+        # first token that isn't entirely inside the chunks emitted so far
+        first_token = int(np.searchsorted(ends, cut, side="right"))
+
+    chunks.append(text[start_char:].strip())
 
     # remove empties
     return [c for c in chunks if c]
 
+def _check_partial(parsed) -> dict:
+    """
+    Normalize one chunk summary to {"summary": str, "clauses": [{"type": str, "snippet": str}]}.
+    Malformed clauses are dropped; raises ValueError if the result is unusable.
+    """
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("summary"), str):
+        raise ValueError("model returned JSON without a string 'summary'")
+    clauses = parsed.get("clauses")
+    if clauses is None:
+        clauses = []
+    if not isinstance(clauses, list):
+        raise ValueError("model returned 'clauses' that is not a list")
+    return {
+        "summary": parsed["summary"],
+        "clauses": [
+            {"type": c["type"], "snippet": c["snippet"]}
+            for c in clauses
+            if isinstance(c, dict) and isinstance(c.get("type"), str) and isinstance(c.get("snippet"), str)
+        ],
+    }
+
 def _merge_clauses(partials):
     """Deterministically merge clause lists from chunk summaries."""
     merged = []
     seen = set()
     for p in partials:
         for c in p.get("clauses", []) or []:
-            t = (str(c.get("type", "")).strip().lower(),
-                 str(c.get("snippet", "")).strip())
-            if not t[1]:  # empty snippet
+            snippet = str(c.get("snippet", "")).strip()
+            if not snippet:  # empty snippet
                 continue
+            # fixed-size key: clauses can be long, no need to keep/compare them in full
+            t = (str(c.get("type", "")).strip().lower(),
+                 xxhash.xxh64_intdigest(snippet.encode()))
             if t in seen:
                 continue
             seen.add(t)
@@ -244,7 +575,23 @@ def _merge_clauses(partials):
     # cap to something reasonable
     return merged[:100]
 
-def _final_summary_from_chunks_summaries(summaries_text: str, jurisdiction: str) -> str:
+async def _groq_json(system_msg: str, user_msg: str):
+    """Run one JSON-mode Groq completion and return the parsed object."""
+    # Not streamed: JSON mode doesn't support streaming, and the object can't be
+    # parsed before it is complete anyway; chunk calls already overlap via gather.
+    async with _groq_semaphore:
+        chat = await groq_client.chat.completions.create(
+            model="llama-3.1-8b-instant",
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg},
+            ],
+        )
+    return orjson.loads(chat.choices[0].message.content or "")
+
+async def _final_summary_from_chunks_summaries(summaries_text: str, jurisdiction: str) -> str:
     """
     Ask the model ONLY for a JSON with {"summary": "..."} using a small input.
     """
@@ -262,23 +609,27 @@ Base your answer on the following combined chunk summaries:
 Return ONLY the JSON.
 """
 
-    chat = groq_client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        temperature=0.2,
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_msg},
-        ],
-    )
-    raw = chat.choices[0].message.content or ""
-    parsed = _try_parse_json(raw)
+    parsed = await _groq_json(system_msg, user_msg)
     # Be defensive: if model returns just a string, accept it
     if isinstance(parsed, dict) and "summary" in parsed:
         return str(parsed["summary"])
     if isinstance(parsed, str):
         return parsed
     # last resort
-    return json.dumps(parsed)[:1000]
+    return orjson.dumps(parsed).decode()[:1000]
+
+# -----------------------------------------------------------------------------
+# Helpers: summary cache
+# -----------------------------------------------------------------------------
+def _content_key(jurisdiction: str, text: str) -> str:
+    # jurisdiction is part of the prompt, so it is part of the key
+    return hashlib.sha256(f"{jurisdiction}\x00{text}".encode()).hexdigest()
+
+
+_doc_summary_cache = _TTLCache(SUMMARY_CACHE_MAX_DOCS, SUMMARY_CACHE_TTL_S)
+# per-chunk results, so a re-upload with small edits reuses most chunks
+_chunk_summary_cache = _TTLCache(SUMMARY_CACHE_MAX_CHUNKS, SUMMARY_CACHE_TTL_S)
+
 # -----------------------------------------------------------------------------
 # Endpoint: summarize (Groq)
 # -----------------------------------------------------------------------------
@@ -293,6 +644,16 @@ async def summarize_doc(payload: SummarizeRequest):
     if not GROQ_API_KEY:
         raise HTTPException(status_code=500, detail="GROQ_API_KEY not configured in .env.")
 
+    # picks up a tokenizer that failed to load earlier (never blocks this request)
+    _schedule_tokenizer_load()
+
+    # Responses are validated once by _summarize_response (before caching) and sent as
+    # ORJSONResponse, which FastAPI doesn't re-validate against response_model.
+    doc_key = _content_key(payload.jurisdiction, payload.text)
+    cached = _doc_summary_cache.get(doc_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
     # 1) Split into safe chunks
     MAX_CHUNK_TOKENS = 1600
     chunks = _split_into_chunks(payload.text, max_tokens=MAX_CHUNK_TOKENS)
@@ -314,7 +675,12 @@ async def summarize_doc(payload: SummarizeRequest):
         "If none found, use an empty array for clauses."
     )
 
-    def summarize_chunk(chunk_text: str) -> dict:
+    async def summarize_chunk(chunk_text: str) -> dict:
+        chunk_key = _content_key(payload.jurisdiction, chunk_text)
+        cached = _chunk_summary_cache.get(chunk_key)
+        if cached is not None:
+            return cached
+
         user_msg = f"""
 Summarize the following legal text in plain English for a non-lawyer, and extract important clauses,
 tailored to the jurisdiction: {payload.jurisdiction}.
@@ -323,27 +689,27 @@ Text:
 \"\"\"{chunk_text}\"\"\"
 Return ONLY the JSON.
 """
-        chat = groq_client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            temperature=0.2,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg},
-            ],
-        )
-        raw = chat.choices[0].message.content or ""
-        return _try_parse_json(raw)
+        # checked before caching, so a malformed reply is retried next time, not replayed
+        partial = _check_partial(await _groq_json(system_msg, user_msg))
+        _chunk_summary_cache.set(chunk_key, partial)
+        return partial
 
-    partials = []
-    try:
-        for ch in chunks:
-            partials.append(summarize_chunk(ch))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Summarization (chunk) failed: {str(e)}")
+    # Chunks are independent → summarize them concurrently (bounded by _groq_semaphore)
+    partials = await asyncio.gather(*[summarize_chunk(ch) for ch in chunks], return_exceptions=True)
+    for p in partials:
+        if isinstance(p, Exception):
+            raise HTTPException(status_code=500, detail=f"Summarization (chunk) failed: {str(p)}")
 
     # 3) Merge clauses deterministically (no model)
     merged_clauses = _merge_clauses(partials)
 
+    # Short docs (the common case) fit in one chunk: its summary already covers
+    # the whole text, so skip the reduce round-trip
+    if len(chunks) == 1 and partials[0].get("summary"):
+        response = _summarize_response(partials[0]["summary"], merged_clauses)
+        _doc_summary_cache.set(doc_key, response)
+        return ORJSONResponse(response)
+
     # 4) Build a compact text of chunk summaries and get a final short summary from the model
     all_summaries_text = " ".join([p.get("summary", "") for p in partials if p.get("summary")])
     # keep the reduce prompt small
@@ -351,12 +717,16 @@ Return ONLY the JSON.
         all_summaries_text = all_summaries_text[:4000]
 
     try:
-        final_summary = _final_summary_from_chunks_summaries(
+        final_summary = await _final_summary_from_chunks_summaries(
             summaries_text=all_summaries_text,
             jurisdiction=payload.jurisdiction
         )
-        return SummarizeResponse(summary=final_summary, clauses=merged_clauses)
     except Exception as e:
         # Fallback: if reduce fails, concatenate summaries and return merged clauses
         fallback_summary = all_summaries_text[:1200] or "Summary not available."
-        return SummarizeResponse(summary=fallback_summary, clauses=merged_clauses)
\ No newline at end of file
+        # not cached, so the next request retries the reduce step
+        return ORJSONResponse(_summarize_response(fallback_summary, merged_clauses))
+
+    response = _summarize_response(final_summary, merged_clauses)
+    _doc_summary_cache.set(doc_key, response)
+    return ORJSONResponse(response)
@@ -57,7 +57,23 @@ export default function App() {
         filetype: data.filetype,
         pages: data.pages,
       });
-      setText(data.text || "");
+
+      // Text is streamed from its own endpoint; render it as it arrives
+      const textRes = await fetch(`${API}${data.text_url}`);
+      if (!textRes.ok) {
+        const errData = await textRes.json().catch(() => ({}));
+        throw new Error(errData.detail || `Fetching text failed (${textRes.status})`);
+      }
+      const reader = textRes.body.getReader();
+      const decoder = new TextDecoder();
+      let received = "";
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        received += decoder.decode(value, { stream: true });
+        setText(received);
+      }
+      setText(received + decoder.decode());
     } catch (err) {
       setError(err.message);
     } finally {
@@ -162,7 +178,8 @@ export default function App() {
 
         <button
           onClick={handleSummarize}
-          disabled={sumLoading || !text}
+          // `loading` stays true until the text stream has fully arrived
+          disabled={sumLoading || loading || !text}
           style={{ padding: "0.45rem 1rem", cursor: "pointer" }}
         >
           {sumLoading ? "Summarizing…" : "Summarize"}